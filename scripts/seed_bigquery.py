@@ -206,7 +206,7 @@ def load_fracfocus() -> pd.DataFrame | None:
         from mt_oil.data.loader import pull_ff_data
         from mt_oil.processing.features import preprocess_ff_data
 
-        raw_ff, _ = pull_ff_data()
+        raw_ff, _ = pull_ff_data(purpose="Proppant")
         df = preprocess_ff_data(raw_ff)
         df = df.reset_index()
         df = df.rename(
@@ -1,9 +1,10 @@
 from fastapi import FastAPI, HTTPException, Query, Path, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -52,6 +53,8 @@ db = DataStore()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    _fit_cached.cache_clear()
+
     if settings.skip_data_load:
         logger.info("[SKIP_DATA_LOAD] Skipping data load for tests.")
         yield
@@ -72,20 +75,24 @@ async def lifespan(app: FastAPI):
         else:
             raw_well = pull_well_data()
             _, raw_prod = pull_prod_data()
-            raw_ff, _ = pull_ff_data()
-            raw_ff["APINumber"] = raw_ff["APINumber"].astype(str)
+            raw_ff, _ = pull_ff_data(purpose="Proppant")
             db.ff_df = preprocess_ff_data(raw_ff)
 
         # Well headers (used by map/filters/details)
         db.well_df = preprocess_well_data(raw_well)
-        db.well_df.index = db.well_df.index.astype(str)
 
-        # Production history (used by production/DCA/economics endpoints)
-        raw_prod["API_WellNo"] = raw_prod["API_WellNo"].astype(str)
+        # Production history (used by production/DCA/economics endpoints).
+        # Both loaders already return API numbers as strings, so the well,
+        # totals and FracFocus indexes line up without re-casting.
         db.totals_df = preprocess_prod_data(raw_prod)
-        db.totals_df.index = db.totals_df.index.astype(str)
 
-        db.prod_df = raw_prod.set_index("API_WellNo").sort_index()
+        # Parse dates once and keep each well's rows in date order so the
+        # per-request endpoints can slice without re-parsing or re-sorting.
+        raw_prod["Rpt_Date"] = pd.to_datetime(raw_prod["Rpt_Date"], cache=True)
+        raw_prod.sort_values(
+            ["API_WellNo", "Rpt_Date"], inplace=True, ignore_index=True
+        )
+        db.prod_df = raw_prod.set_index("API_WellNo")
 
         # Producing wells set for "has_production" filter
         sums = db.prod_df.groupby(level=0)[["BBLS_OIL_COND", "MCF_GAS"]].sum()
@@ -102,7 +109,6 @@ async def lifespan(app: FastAPI):
         if db.ff_df is not None and not db.ff_df.empty:
             try:
                 logger.info("Merging datasets for ML features...")
-                db.ff_df.index = db.ff_df.index.astype(str)
                 db.merged_df = merge_data(
                     db.totals_df, db.well_df, db.ff_df, interval=720
                 )
@@ -140,6 +146,7 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    _fit_cached.cache_clear()
     db.well_df = None
     db.prod_df = None
     db.totals_df = None
@@ -207,21 +214,25 @@ def get_wells(
     if db.well_df is None:
         raise HTTPException(status_code=503, detail="Data not loaded")
 
-    df = db.well_df.reset_index()
+    df = db.well_df
 
+    # Combine the filters into one row mask and only materialize the page
+    keep = np.ones(len(df), dtype=bool)
     if has_production:
         if db.producing_wells_set is None:
             raise HTTPException(status_code=503, detail="Production data not loaded")
-        df = df[df["API_WellNo"].isin(db.producing_wells_set)]
+        keep &= df.index.isin(db.producing_wells_set)
 
     if formation:
-        df = df[df["ST_FMTN_CD"] == formation]
+        keep &= (df["ST_FMTN_CD"] == formation).to_numpy()
     if well_type:
-        df = df[df["Type"] == well_type]
+        keep &= (df["Type"] == well_type).to_numpy()
     if slant:
-        df = df[df["Slant"] == slant]
+        keep &= (df["Slant"] == slant).to_numpy()
 
-    filtered = df.iloc[skip:] if limit <= 0 else df.iloc[skip : skip + limit]
+    rows = np.flatnonzero(keep)
+    rows = rows[skip:] if limit <= 0 else rows[skip : skip + limit]
+    filtered = df.iloc[rows].reset_index()
     filtered = filtered.replace([np.inf, -np.inf, np.nan], None)
     return filtered.to_dict(orient="records")
 
@@ -261,13 +272,11 @@ def get_well_production(request: Request, api_number: str):
     if well_data.empty:
         return []
 
-    result = (
-        well_data[["Rpt_Date", "BBLS_OIL_COND", "MCF_GAS", "BBLS_WTR", "DAYS_PROD"]]
-        .fillna(0)
-        .replace([np.inf, -np.inf], 0)
-    )
-    result["Rpt_Date"] = pd.to_datetime(result["Rpt_Date"])
-    result = result.sort_values("Rpt_Date")
+    # Undated reports (NaT) cannot be placed in the history; as in
+    # _prod_arrays they are dropped. Only the volumes are zero-filled.
+    volume_cols = ["BBLS_OIL_COND", "MCF_GAS", "BBLS_WTR", "DAYS_PROD"]
+    result = well_data.loc[well_data["Rpt_Date"].notna(), ["Rpt_Date", *volume_cols]]
+    result[volume_cols] = result[volume_cols].fillna(0).replace([np.inf, -np.inf], 0)
 
     return result.to_dict(orient="records")
 
@@ -301,54 +310,65 @@ async def train_model(request: Request, background_tasks: BackgroundTasks):
     return {"status": "Training started in background"}
 
 
-@app.post("/wells/{api_number}/decline")
-@limiter.limit("30/minute")
-def fit_decline_curve(
-    request: Request,
-    api_number: str,
-    method: str = Query("auto", enum=["auto", "arps", "duong"]),
-):
-    prod_hist = get_well_production(request, api_number)
-    if not prod_hist:
+FORECAST_MONTHS = 24
+
+
+def _well_rows(api_number: str) -> pd.DataFrame:
+    """Returns a well's production rows in date order, or raises 503/404."""
+    if db.prod_df is None:
+        raise HTTPException(status_code=503, detail="Data not loaded")
+    if api_number not in db.prod_df.index:
         raise HTTPException(status_code=404, detail="No production history found")
+    # Rows are already date-sorted per well (see lifespan)
+    return db.prod_df.loc[[api_number]]
+
+
+def _prod_arrays(api_number: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the producing months of a well's oil history as NumPy arrays.
+
+    Returns:
+        Tuple of (t_months, q_oil), where t_months counts 30-day months from the
+        first producing report (starting at 1).
+    """
+    sub = _well_rows(api_number)
+    q_oil = sub["BBLS_OIL_COND"].to_numpy(dtype=float)
+    dates = sub["Rpt_Date"].to_numpy()
+    # Reports without a date (coerced to NaT) have no place on the time axis.
+    producing = (q_oil > 0) & np.isfinite(q_oil) & ~np.isnat(dates)
+    dates = dates[producing]
+    if not len(dates):
+        return np.array([], dtype=np.int64), q_oil[producing]
+
+    days = (dates - dates[0]).astype("timedelta64[D]").astype(np.int64)
+    return days // 30 + 1, q_oil[producing]
+
+
+@lru_cache(maxsize=4096)
+def _fit_cached(
+    api_number: str, method: str
+) -> Tuple[int, Dict, np.ndarray, np.ndarray]:
+    """
+    Fits a decline curve to a well's oil history and forecasts it forward.
+
+    Results are cached per (api_number, method) because the fit only depends on
+    the loaded production data; the cache is cleared whenever data is (re)loaded.
+    Callers must not mutate the returned objects.
 
-    df = pd.DataFrame(prod_hist)
-    df = df[df["BBLS_OIL_COND"] > 0].reset_index(drop=True)
+    Returns:
+        Tuple of (historical_data_points, best_fit, forecast_months,
+        forecast_production).
+    """
+    t_months, q_oil = _prod_arrays(api_number)
 
-    if len(df) < 6:
+    if len(q_oil) < 6:
         raise HTTPException(
             status_code=400, detail="Insufficient data for decline curve analysis"
         )
 
-    df["Month_Index"] = (df["Rpt_Date"] - df["Rpt_Date"].min()).dt.days // 30 + 1
-    t_months = df["Month_Index"].values
-    q_oil = df["BBLS_OIL_COND"].values
-
     best_fit = fit_best_decline(t_months, q_oil, method=method)
 
-    # ML Constrained Logic (Fine-Tuning)
-    predicted_boe_eur = None
-    if db.ml_model and api_number in db.merged_df.index:
-        # Check if history is short (<12 months)
-        if len(df) <= 12:
-            try:
-                # Get features for this well
-                X_well = db.merged_df.loc[[api_number]].drop("BOE", axis=1)
-                predicted_boe_eur = db.ml_model.predict(X_well)[0]
-
-                # If predicted EUR is significantly different from fit, assume fit is bad due to short history
-                # This is a simple heuristic: if fit shows infinite growth or huge EUR, clamp it?
-                # For now, we will just return the ML EUR as extra info to the frontend
-                # or simpler: "Fine-tune" by logging it.
-                # Improving accuracy strategy:
-                # If Arps b > 1.5, clamp to 1.5? Or if forecasted EUR > 2x ML EUR, warn?
-                # Let's just include "ml_predicted_eur" in the response so the frontend can compare.
-                pass
-            except Exception as e:
-                logger.warning("ML Prediction failed: %s", e)
-
     # Generate forecast
-    FORECAST_MONTHS = 24
     last_t = t_months[-1]
     forecast_t = np.arange(last_t + 1, last_t + FORECAST_MONTHS + 1)
 
@@ -357,24 +377,58 @@ def fit_decline_curve(
     elif best_fit["method"] == "duong":
         forecast_q = duong_decline(forecast_t, **best_fit["params"])
     else:
-        forecast_q = []
-
-    def to_native(obj):
-        if isinstance(obj, (np.integer, np.int64)):
-            return int(obj)
-        elif isinstance(obj, (np.floating, np.float64)):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {k: to_native(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [to_native(i) for i in obj]
-        return obj
+        forecast_q = np.array([])
+
+    return len(q_oil), best_fit, forecast_t, forecast_q
+
+
+def _ml_predicted_eur(api_number: str, historical_data_points: int) -> Optional[float]:
+    """Returns the ML model's 24-month BOE estimate for short-history wells."""
+    # ML Constrained Logic (Fine-Tuning)
+    if not db.ml_model or db.merged_df is None or api_number not in db.merged_df.index:
+        return None
+
+    # Check if history is short (<12 months)
+    if historical_data_points > 12:
+        return None
+
+    try:
+        # Get features for this well
+        X_well = db.merged_df.loc[[api_number]].drop("BOE", axis=1)
+        # If predicted EUR is significantly different from fit, assume fit is bad due to short history
+        # This is a simple heuristic: if fit shows infinite growth or huge EUR, clamp it?
+        # For now, we will just return the ML EUR as extra info to the frontend
+        # or simpler: "Fine-tune" by logging it.
+        # Improving accuracy strategy:
+        # If Arps b > 1.5, clamp to 1.5? Or if forecasted EUR > 2x ML EUR, warn?
+        # Let's just include "ml_predicted_eur" in the response so the frontend can compare.
+        return db.ml_model.predict(X_well)[0]
+    except Exception as e:
+        logger.warning("ML Prediction failed: %s", e)
+        return None
+
+
+@app.post("/wells/{api_number}/decline")
+@limiter.limit("30/minute")
+def fit_decline_curve(
+    request: Request,
+    api_number: str,
+    method: str = Query("auto", enum=["auto", "arps", "duong"]),
+):
+    historical_data_points, best_fit, forecast_t, forecast_q = _fit_cached(
+        api_number, method
+    )
+    predicted_boe_eur = _ml_predicted_eur(api_number, historical_data_points)
+
+    # Fit params and score are np.float64 (a float subclass) and serialize as is;
+    # only the prediction array needs converting. Copy: best_fit is cached.
+    fit = dict(best_fit)
+    if "prediction" in fit:
+        fit["prediction"] = fit["prediction"].tolist()
 
     metrics = {
-        "historical_data_points": int(len(df)),
-        "fit": to_native(best_fit),
+        "historical_data_points": int(historical_data_points),
+        "fit": fit,
         "forecast": {"months": forecast_t.tolist(), "production": forecast_q.tolist()},
     }
 
@@ -398,29 +452,30 @@ def run_economics(
     opex: float = 10.0,
     abandonment_rate_daily: float = 5.0,
 ):
-    fit_res = fit_decline_curve(request, api_number, method="auto")
-    if not fit_res["forecast"]["production"]:
+    historical_data_points, _, _, forecast_q = _fit_cached(api_number, "auto")
+    if len(forecast_q) == 0:
         raise HTTPException(status_code=400, detail="Could not forecast production")
 
-    forecast_oil_prod = fit_res["forecast"]["production"]
-    prod_hist = get_well_production(request, api_number)
+    # Volumes stay float64 arrays all the way into calculate_npv
+    forecast_oil_prod = forecast_q
 
     # Extract historical oil and gas production
-    historical_oil_prod = [
-        r["BBLS_OIL_COND"] for r in prod_hist if r["BBLS_OIL_COND"] is not None
-    ]
-    historical_gas_prod = [r["MCF_GAS"] for r in prod_hist if r["MCF_GAS"] is not None]
+    hist = np.nan_to_num(
+        _well_rows(api_number)[["BBLS_OIL_COND", "MCF_GAS"]].to_numpy(dtype=float),
+        nan=0.0,
+        posinf=0.0,
+        neginf=0.0,
+    )
+    historical_oil_prod = hist[:, 0]
+    historical_gas_prod = hist[:, 1]
 
     # For forecast, we only have oil forecast from DCA
     # Assume gas-to-oil ratio from historical data for forecast
-    if historical_oil_prod and historical_gas_prod:
-        total_hist_oil = sum(historical_oil_prod)
-        total_hist_gas = sum(historical_gas_prod)
-        gor = total_hist_gas / total_hist_oil if total_hist_oil > 0 else 0
-    else:
-        gor = 0
+    total_hist_oil = historical_oil_prod.sum()
+    total_hist_gas = historical_gas_prod.sum()
+    gor = total_hist_gas / total_hist_oil if total_hist_oil > 0 else 0
 
-    forecast_gas_prod = [oil_vol * gor for oil_vol in forecast_oil_prod]
+    forecast_gas_prod = forecast_oil_prod * gor
 
     abandonment_rate_monthly = abandonment_rate_daily * 30.4
 
@@ -438,7 +493,8 @@ def run_economics(
     )
 
     # Add ML comparison if available
-    if "ml_predicted_eur_24mo" in fit_res:
-        econ_metrics["ml_predicted_eur_24mo"] = fit_res["ml_predicted_eur_24mo"]
+    predicted_boe_eur = _ml_predicted_eur(api_number, historical_data_points)
+    if predicted_boe_eur:
+        econ_metrics["ml_predicted_eur_24mo"] = float(predicted_boe_eur)
 
     return econ_metrics
@@ -31,6 +31,7 @@ class Settings:
     gis_data_bucket: str  # GCS bucket for serving GIS GeoJSON (same as gcs_data_bucket)
     bigquery_dataset: str
     model_path: str
+    data_cache_dir: str
     enable_local_data: bool
     frontend_url: str
     log_level: str
@@ -76,6 +77,7 @@ def load_settings() -> Settings:
         gis_data_bucket=os.getenv("GIS_DATA_BUCKET", os.getenv("GCS_DATA_BUCKET", "")),
         bigquery_dataset=os.getenv("BIGQUERY_DATASET", ""),
         model_path=os.getenv("MODEL_PATH", "rf_model.joblib"),
+        data_cache_dir=os.getenv("DATA_CACHE_DIR", "~/.cache/mt_oil"),
         enable_local_data=os.getenv("ENABLE_LOCAL_DATA", "true").lower()
         in ("1", "true", "yes"),
         frontend_url=os.getenv("FRONTEND_URL", "http://localhost:5173"),
@@ -1,10 +1,189 @@
 import zipfile
-from urllib.request import urlopen
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+import hashlib
 import shutil
 import os
 import fnmatch
+import tempfile
+from pathlib import Path
 import pandas as pd
-from typing import Tuple
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
+from typing import IO, Callable, Dict, Optional, Tuple, Union
+
+from mt_oil.config import settings
+
+PROD_URL = "https://bogfiles.dnrc.mt.gov//Reporting/Production/Historical/MT_Historical_Production.zip"
+WELL_URL = "https://bogfiles.dnrc.mt.gov//Reporting/Wells/MT_CompleteWellList.zip"
+FF_URL = "https://www.fracfocusdata.org/digitaldownload/FracFocusCSV.zip"
+
+# Bump when parsing changes in a way the column schemas below do not capture,
+# so Parquet snapshots written by older code are not served.
+CACHE_SCHEMA_VERSION = 1
+
+# Downloaded archives are held in memory up to this size and spill to an
+# anonymous temp file beyond it, so large archives cannot exhaust the container.
+DOWNLOAD_SPOOL_BYTES = 64 << 20
+
+
+# Columns of the DNRC exports used downstream. IDs and codes are declared as
+# text so they are never inferred as numbers; numeric columns are inferred.
+WELL_PROD_COLUMNS = {
+    "API_WellNo": pa.string(),
+    "Rpt_Date": None,
+    "ST_FMTN_CD": pa.string(),
+    "BBLS_OIL_COND": None,
+    "MCF_GAS": None,
+    "BBLS_WTR": None,
+    "DAYS_PROD": None,
+}
+WELL_LIST_COLUMNS = {
+    "API_WellNo": pa.string(),
+    "Lat": None,
+    "Long": None,
+    "Slant": pa.string(),
+    "Type": pa.string(),
+    "DTD": None,
+}
+# FracFocus registry columns needed by preprocess_ff_data. The streaming reader
+# fixes column types from the first block, so they are declared up front
+# rather than inferred.
+FF_REGISTRY_COLUMNS = {
+    "APINumber": pa.string(),
+    "StateName": pa.string(),
+    "Purpose": pa.string(),
+    "PercentHFJob": pa.float64(),
+    "MassIngredient": pa.float64(),
+    "TVD": pa.float64(),
+    "TotalBaseWaterVolume": pa.float64(),
+    "TotalBaseNonWaterVolume": pa.float64(),
+}
+
+
+def _read_tab(
+    source: Union[str, IO[bytes]],
+    columns: Optional[Dict[str, Optional[pa.DataType]]] = None,
+) -> pd.DataFrame:
+    """
+    Parses a tab-separated DNRC export with the multi-threaded Arrow CSV reader.
+
+    Args:
+        source (Union[str, IO[bytes]]): Path to the .tab file, or an open
+            binary stream such as a zip archive member.
+        columns (Optional[Dict[str, Optional[pa.DataType]]]): Columns to load,
+            mapped to their Arrow type (None to infer). Defaults to all columns.
+
+    Returns:
+        pd.DataFrame: Parsed data with NumPy-backed numeric columns.
+    """
+    columns = columns or {}
+    table = pacsv.read_csv(
+        source,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+        parse_options=pacsv.ParseOptions(delimiter="\t"),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(columns),
+            column_types={c: t for c, t in columns.items() if t is not None},
+            # Match pandas: empty text fields are missing values.
+            strings_can_be_null=True,
+        ),
+    )
+    # self_destruct frees each Arrow buffer once it has been converted.
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _download(url: str, file_name: Optional[str] = None) -> IO[bytes]:
+    """
+    Streams *url* into a seekable buffer positioned at the start.
+
+    Args:
+        url (str): URL to download.
+        file_name (Optional[str]): If set, write the download to this file on
+            disk instead of a spooled temporary buffer.
+
+    Returns:
+        IO[bytes]: Open binary file; the caller is responsible for closing it.
+    """
+    out = (
+        open(file_name, "w+b")
+        if file_name
+        else tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_BYTES)
+    )
+    try:
+        with urlopen(url) as response:
+            shutil.copyfileobj(response, out, 1 << 20)
+        out.seek(0)
+    except BaseException:
+        out.close()
+        raise
+    return out
+
+
+def _remote_version(url: str) -> Optional[str]:
+    """Returns the ETag (or Last-Modified) header of *url*, or None if unavailable."""
+    try:
+        with urlopen(Request(url, method="HEAD"), timeout=30) as response:
+            return response.headers.get("ETag") or response.headers.get("Last-Modified")
+    except (URLError, OSError) as e:
+        print(f"Could not check {url} for updates: {e}")
+        return None
+
+
+def _cached_frames(
+    url: str,
+    names: Tuple[str, ...],
+    load: Callable[[], Tuple[pd.DataFrame, ...]],
+    schema: object = None,
+) -> Tuple[pd.DataFrame, ...]:
+    """
+    Returns the DataFrames parsed from *url*, using a Parquet snapshot on disk
+    while the remote file's ETag / Last-Modified header is unchanged.
+
+    Args:
+        url (str): Source URL; together with *names* it keys the cache entry.
+        names (Tuple[str, ...]): One name per DataFrame returned by *load*.
+        load (Callable): Downloads and parses the source when the cache is stale.
+        schema (object): Column projection / types *load* parses with. Its repr
+            is part of the cache key, so changing it invalidates old snapshots.
+
+    Returns:
+        Tuple[pd.DataFrame, ...]: The DataFrames, in the order given by *names*.
+    """
+    if not settings.data_cache_dir:
+        return load()
+
+    cache_dir = Path(settings.data_cache_dir).expanduser()
+    key = hashlib.sha1(f"{CACHE_SCHEMA_VERSION}|{url}|{schema!r}".encode()).hexdigest()
+    paths = [cache_dir / f"{key}-{name}.parquet" for name in names]
+    version_path = cache_dir / f"{key}-{'-'.join(names)}.etag"
+
+    version = _remote_version(url)
+    if (
+        version
+        and version_path.exists()
+        and version_path.read_text() == version
+        and all(path.exists() for path in paths)
+    ):
+        print(f"Source unchanged since last download. Loading cached {url}")
+        return tuple(pd.read_parquet(path) for path in paths)
+
+    frames = load()
+
+    if version:
+        # Best effort: a cache that cannot be written just means the next call
+        # downloads again.
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            version_path.unlink(missing_ok=True)
+            for frame, path in zip(frames, paths):
+                frame.to_parquet(path, compression="zstd")
+            version_path.write_text(version)
+        except (OSError, ValueError, pa.ArrowException) as e:
+            print(f"Could not cache {url}: {e}")
+
+    return frames
 
 
 def pull_prod_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -16,41 +195,34 @@ def pull_prod_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
             - lease_prod_df: DataFrame containing lease production data.
             - well_prod_df: DataFrame containing well production data.
     """
-    url = "https://bogfiles.dnrc.mt.gov//Reporting/Production/Historical/MT_Historical_Production.zip"
-    file_name = "MT_Historical_Production.zip"
-
-    try:
-        # Check if extracted files already exist
-        if os.path.exists("MT_HistoricalPRUProduction.tab") and os.path.exists(
-            "MT_HistoricalWellProduction.tab"
-        ):
-            print("Production data files found locally. Skipping download.")
-        else:
-            print("Downloading production data...")
-            # extracting zipfile from URL
-            with urlopen(url) as response, open(file_name, "wb") as out_file:
-                shutil.copyfileobj(response, out_file)
-
-            # extracting required file from zipfile
-            with zipfile.ZipFile(file_name) as zf:
-                zf.extract("MT_HistoricalPRUProduction.tab")
-                zf.extract("MT_HistoricalWellProduction.tab")
-
-        # loading data from the file
+    # Check if extracted files already exist
+    if os.path.exists("MT_HistoricalPRUProduction.tab") and os.path.exists(
+        "MT_HistoricalWellProduction.tab"
+    ):
+        print("Production data files found locally. Skipping download.")
         print("Loading production data into DataFrames...")
-        lease_prod_df = pd.read_csv(
-            "MT_HistoricalPRUProduction.tab", sep="\t", low_memory=False
-        )
-        well_prod_df = pd.read_csv(
-            "MT_HistoricalWellProduction.tab", sep="\t", low_memory=False
-        )
-
+        lease_prod_df = _read_tab("MT_HistoricalPRUProduction.tab")
+        well_prod_df = _read_tab("MT_HistoricalWellProduction.tab", WELL_PROD_COLUMNS)
         return lease_prod_df, well_prod_df
 
-    finally:
-        # Cleanup zip only if it exists
-        if os.path.exists(file_name):
-            os.remove(file_name)
+    lease_prod_df, well_prod_df = _cached_frames(
+        PROD_URL, ("lease_prod", "well_prod"), _fetch_prod_data, WELL_PROD_COLUMNS
+    )
+    return lease_prod_df, well_prod_df
+
+
+def _fetch_prod_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Downloads and parses the DNRC historical production archive."""
+    print("Downloading production data...")
+    # The .tab members are parsed straight out of the archive, never extracted.
+    with _download(PROD_URL) as archive, zipfile.ZipFile(archive) as zf:
+        print("Loading production data into DataFrames...")
+        with zf.open("MT_HistoricalPRUProduction.tab") as f:
+            lease_prod_df = _read_tab(f)
+        with zf.open("MT_HistoricalWellProduction.tab") as f:
+            well_prod_df = _read_tab(f, WELL_PROD_COLUMNS)
+
+    return lease_prod_df, well_prod_df
 
 
 def pull_well_data() -> pd.DataFrame:
@@ -60,32 +232,23 @@ def pull_well_data() -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame containing well header information (Lat, Long, etc).
     """
-    url = "https://bogfiles.dnrc.mt.gov//Reporting/Wells/MT_CompleteWellList.zip"
-    file_name = "MT_CompleteWellList.zip"
-
-    try:
-        # extracting zipfile from URL
-        with urlopen(url) as response, open(file_name, "wb") as out_file:
-            shutil.copyfileobj(response, out_file)
+    (well_data_df,) = _cached_frames(
+        WELL_URL, ("well_list",), lambda: (_fetch_well_data(),), WELL_LIST_COLUMNS
+    )
+    return well_data_df
 
-        # extracting required file from zipfile
-        with zipfile.ZipFile(file_name) as zf:
-            zf.extract("MT_HistoricalWellList.tab")
 
-        # loading data from the file
-        well_data_df = pd.read_csv(
-            "MT_HistoricalWellList.tab", sep="\t", low_memory=False
-        )
-
-        return well_data_df
-
-    finally:
-        if os.path.exists(file_name):
-            os.remove(file_name)
+def _fetch_well_data() -> pd.DataFrame:
+    """Downloads and parses the DNRC well list archive."""
+    with _download(WELL_URL) as archive, zipfile.ZipFile(archive) as zf:
+        with zf.open("MT_HistoricalWellList.tab") as f:
+            return _read_tab(f, WELL_LIST_COLUMNS)
 
 
 def pull_ff_data(
-    state_name: str = "Montana", keep_zip: bool = False
+    state_name: str = "Montana",
+    keep_zip: bool = False,
+    purpose: Optional[str] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Retrieves FracFocus registry data for a single state.
@@ -94,68 +257,102 @@ def pull_ff_data(
         state_name (str): Name of the state to filter data for. Defaults to "Montana".
         keep_zip (bool): If True, leave the downloaded FracFocusCSV.zip on disk so
             callers (e.g. the Cloud Run Job) can archive it to GCS. Defaults to False.
+        purpose (Optional[str]): If set, keep only ingredient rows with this
+            `Purpose` (e.g. "Proppant"). Defaults to None (all rows).
 
     Returns:
         Tuple[pd.DataFrame, pd.DataFrame]:
             - FracFocusRegistry_df: Registry data.
             - registryupload_df: Empty placeholder kept for backwards compatibility.
     """
-    url = "https://www.fracfocusdata.org/digitaldownload/FracFocusCSV.zip"
+    if keep_zip:
+        # The caller needs the raw archive on disk, so always download it.
+        return _fetch_ff_data(state_name, keep_zip, purpose), pd.DataFrame()
+
+    (registry_df,) = _cached_frames(
+        FF_URL,
+        (f"registry-{state_name or 'all'}-{purpose or 'all'}",),
+        lambda: (_fetch_ff_data(state_name, keep_zip, purpose),),
+        FF_REGISTRY_COLUMNS,
+    )
+    return registry_df, pd.DataFrame()
+
+
+def _fetch_ff_data(
+    state_name: str, keep_zip: bool, purpose: Optional[str]
+) -> pd.DataFrame:
+    """Downloads the FracFocus archive and parses the filtered registry rows."""
     file_name = "FracFocusCSV.zip"
     # Only the columns needed by preprocess_ff_data are loaded, which keeps the
     # memory footprint small enough to run in a 4 GiB Cloud Run Job container.
-    registry_cols = {
-        "APINumber",
-        "StateName",
-        "Purpose",
-        "PercentHFJob",
-        "MassIngredient",
-        "TVD",
-        "TotalBaseWaterVolume",
-        "TotalBaseNonWaterVolume",
-    }
+    registry_types = FF_REGISTRY_COLUMNS
     required_cols = {"APINumber", "Purpose", "MassIngredient"}
-    chunksize = 200_000
 
-    try:
-        print("Downloading FracFocus data...")
-        with urlopen(url) as response, open(file_name, "wb") as out_file:
-            shutil.copyfileobj(response, out_file)
-
-        registry_chunks: list[pd.DataFrame] = []
-        with zipfile.ZipFile(file_name) as zip_file:
-            registry_files = [
-                info
-                for info in zip_file.infolist()
-                if fnmatch.fnmatch(info.filename, "FracFocusRegistry*.csv")
-            ]
-
-            if not registry_files:
-                raise ValueError("No FracFocus registry CSVs found in archive")
-
-            for info in registry_files:
-                print(f"Reading {info.filename}...")
-                with zip_file.open(info.filename) as f:
-                    for chunk in pd.read_csv(
-                        f,
-                        low_memory=False,
-                        chunksize=chunksize,
-                        usecols=lambda col: col in registry_cols,
-                    ):
-                        if state_name and "StateName" in chunk.columns:
-                            chunk = chunk[chunk["StateName"] == state_name]
-                        registry_chunks.append(chunk)
-
-        if not registry_chunks:
-            raise ValueError("No FracFocus data chunks found")
-
-        registry_df = pd.concat(registry_chunks, ignore_index=True)
-        missing = required_cols - set(registry_df.columns)
-        if missing:
-            raise ValueError(f"Required columns missing from FracFocus data: {missing}")
-
-        return registry_df, pd.DataFrame()
-
-    finally:
-        if not keep_zip and os.path.exists(file_name):
-            os.remove(file_name)
+    print("Downloading FracFocus data...")
+    registry_tables: list[pa.Table] = []
+    # Only keep_zip callers need the archive on disk (to upload it).
+    with (
+        _download(FF_URL, file_name if keep_zip else None) as archive,
+        zipfile.ZipFile(archive) as zip_file,
+    ):
+        registry_files = [
+            info
+            for info in zip_file.infolist()
+            if fnmatch.fnmatch(info.filename, "FracFocusRegistry*.csv")
+        ]
+
+        if not registry_files:
+            raise ValueError("No FracFocus registry CSVs found in archive")
+
+        for info in registry_files:
+            print(f"Reading {info.filename}...")
+            with zip_file.open(info.filename) as f:
+                # Header names as Arrow itself parses them (BOM, quoting),
+                # matched to the registry columns ignoring stray whitespace.
+                header_line = f.readline().rstrip(b"\r\n") + b"\n"
+                header = pacsv.read_csv(pa.py_buffer(header_line)).column_names
+            source_names = {name.strip(): name for name in header}
+            columns = [c for c in registry_types if c in source_names]
+            if not columns:
+                # An empty projection would make Arrow load every column.
+                raise ValueError(
+                    f"No FracFocus registry columns found in {info.filename}"
+                )
+            with zip_file.open(info.filename) as f:
+                reader = pacsv.open_csv(
+                    f,
+                    read_options=pacsv.ReadOptions(use_threads=True),
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=[source_names[c] for c in columns],
+                        column_types={
+                            source_names[c]: registry_types[c] for c in columns
+                        },
+                        strings_can_be_null=True,
+                    ),
+                )
+                # Filter each batch as it is read so rows for other
+                # states / purposes are never held in memory.
+                batches = []
+                for batch in reader:
+                    keep = None
+                    if state_name and "StateName" in columns:
+                        keep = pc.equal(batch[source_names["StateName"]], state_name)
+                    if purpose and "Purpose" in columns:
+                        is_purpose = pc.equal(batch[source_names["Purpose"]], purpose)
+                        keep = is_purpose if keep is None else pc.and_(keep, is_purpose)
+                    batches.append(batch if keep is None else batch.filter(keep))
+                registry_tables.append(
+                    pa.Table.from_batches(batches, schema=reader.schema).rename_columns(
+                        columns
+                    )
+                )
+
+    registry_df = pa.concat_tables(
+        registry_tables, promote_options="default"
+    ).to_pandas(split_blocks=True, self_destruct=True)
+    missing = required_cols - set(registry_df.columns)
+    if missing:
+        raise ValueError(f"Required columns missing from FracFocus data: {missing}")
+
+    print(f"Loaded {len(registry_df)} FracFocus registry rows.")
+    return registry_df
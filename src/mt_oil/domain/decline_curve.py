@@ -1,6 +1,9 @@
+import copy
+from functools import lru_cache
+
 import numpy as np
-from scipy.optimize import curve_fit
-from typing import Dict
+from scipy.optimize import least_squares
+from typing import Callable, Dict, Tuple
 
 
 def arps_decline(t: np.ndarray, qi: float, di: float, b: float) -> np.ndarray:
@@ -11,7 +14,8 @@ def arps_decline(t: np.ndarray, qi: float, di: float, b: float) -> np.ndarray:
     # handle b=0 case (exponential)
     if np.isclose(b, 0):
         return qi * np.exp(-di * t)
-    return qi / np.power((1 + b * di * t), (1 / b))
+    # exp/log1p is cheaper than a fractional pow and accurate for small b*di*t
+    return qi * np.exp(-np.log1p(b * di * t) / b)
 
 
 def modified_arps_decline(
@@ -37,22 +41,18 @@ def modified_arps_decline(
     t_switch = (di / d_lim - 1) / (b * di)
 
     # q_switch at time t_switch
-    q_switch = qi / np.power((1 + b * di * t_switch), (1 / b))
-
-    # Arrays
-    q = np.zeros_like(t, dtype=float)
-
-    mask_hyp = t <= t_switch
-    mask_exp = t > t_switch
+    q_switch = qi * np.exp(-np.log1p(b * di * t_switch) / b)
 
+    # Evaluate both branches over the whole array and pick per element.
     # Hyperbolic part
-    q[mask_hyp] = arps_decline(t[mask_hyp], qi, di, b)
+    q_hyp = arps_decline(t, qi, di, b)
 
     # Exponential part
-    # q(t) = q_switch * exp(-d_lim * (t - t_switch))
-    q[mask_exp] = q_switch * np.exp(-d_lim * (t[mask_exp] - t_switch))
+    # q(t) = q_switch * exp(-d_lim * (t - t_switch)), clamped at the switch so
+    # the unused early values cannot overflow.
+    q_exp = q_switch * np.exp(-d_lim * np.maximum(t - t_switch, 0))
 
-    return q
+    return np.where(t <= t_switch, q_hyp, q_exp)
 
 
 def duong_decline(t: np.ndarray, qi: float, a: float, m: float) -> np.ndarray:
@@ -71,10 +71,66 @@ def duong_decline(t: np.ndarray, qi: float, a: float, m: float) -> np.ndarray:
     if np.isclose(m, 1):
         return qi * np.power(t_safe, -1.0)  # Harmonic-ish limit
 
-    term1 = np.power(t_safe, -m)
-    term2 = np.exp((a / (1 - m)) * (np.power(t_safe, 1 - m) - 1))
+    # t^(1-m) - 1 as expm1((1-m) log t): no cancellation for m near 1
+    log_t = np.log(t_safe)
+    c = 1 - m
+    return qi * np.exp(-m * log_t + (a / c) * np.expm1(c * log_t))
+
+
+def _arps_jac(t: np.ndarray, qi: float, di: float, b: float) -> np.ndarray:
+    """
+    Jacobian of `arps_decline` with respect to (qi, di, b), shape (len(t), 3).
+    """
+    if np.isclose(b, 0):
+        # Exponential limit; dq/db -> q * (di * t)^2 / 2 as b -> 0.
+        decay = np.exp(-di * t)
+        q = qi * decay
+        return np.column_stack([decay, -t * q, q * (di * t) ** 2 / 2])
+
+    x = b * di * t
+    d = 1 + x
+    # log1p keeps log(d) / b^2 accurate for small b, where it nearly cancels
+    log_d = np.log1p(x)
+    decay = np.exp(-log_d / b)
+    q = qi * decay
+    dq_ddi = -t * q / d
+    dq_db = q * (log_d / b**2 - di * t / (b * d))
+    return np.column_stack([decay, dq_ddi, dq_db])
+
+
+def _duong_fit_functions(t: np.ndarray) -> Tuple[Callable, Callable]:
+    """
+    Builds `duong_decline` and its Jacobian as closures over a fixed time array.
+
+    The solver only varies the parameters, so log(t) is computed once per fit
+    and every power of t becomes exp(k * log_t). The returned functions ignore
+    their time argument and must only be evaluated at *t*.
+
+    Returns:
+        Tuple of (model, jacobian) with the model signature f(t, qi, a, m).
+    """
+    log_t = np.log(np.where(t < 1, 1, t))
 
-    return qi * term1 * term2
+    def model(_t: np.ndarray, qi: float, a: float, m: float) -> np.ndarray:
+        if np.isclose(m, 1):
+            return qi * np.exp(-log_t)  # Harmonic-ish limit
+        c = 1 - m
+        return qi * np.exp(-m * log_t + (a / c) * np.expm1(c * log_t))
+
+    def jacobian(_t: np.ndarray, qi: float, a: float, m: float) -> np.ndarray:
+        if np.isclose(m, 1):
+            zeros = np.zeros_like(log_t)
+            return np.column_stack([np.exp(-log_t), zeros, zeros])
+
+        c = 1 - m
+        growth = np.expm1(c * log_t)  # t^(1-m) - 1
+        shape = np.exp(-m * log_t + (a / c) * growth)
+        q = qi * shape
+        dq_da = q * growth / c
+        dq_dm = q * (-log_t + a * (growth / c**2 - log_t * (growth + 1) / c))
+        return np.column_stack([shape, dq_da, dq_dm])
+
+    return model, jacobian
 
 
 def fit_best_decline(
@@ -83,37 +139,99 @@ def fit_best_decline(
     """
     Fits decline curves to production data and returns the parameters of the best fit.
 
+    Fits are memoized on the content of the inputs, so refitting an unchanged
+    production history is a cache lookup. Callers get their own copy.
+
     Args:
         time_months: Array of time in months.
-        production: Array of production rates.
+        production: Array of production rates (finite values only).
         method: 'arps', 'modified_arps', 'duong', or 'auto'
 
     Returns:
         Dictionary containing 'method', 'parameters', 'score' (mse).
     """
+    time_months = np.ascontiguousarray(time_months, dtype=np.float64)
+    production = np.ascontiguousarray(production, dtype=np.float64)
+    best_fit = _fit_best_decline_cached(
+        time_months.tobytes(), production.tobytes(), method
+    )
+    return copy.deepcopy(best_fit)
+
+
+@lru_cache(maxsize=4096)
+def _fit_best_decline_cached(
+    time_bytes: bytes, production_bytes: bytes, method: str
+) -> Dict:
+    """Memoized `_fit_best_decline` keyed on the raw float64 input buffers."""
+    return _fit_best_decline(
+        np.frombuffer(time_bytes), np.frombuffer(production_bytes), method
+    )
+
+
+def _robust_fit(
+    model: Callable,
+    jac: Callable,
+    t: np.ndarray,
+    production: np.ndarray,
+    x0: list,
+    bounds: Tuple[list, list],
+    f_scale: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bounded soft-L1 least-squares fit of `model(t, *params)` to production.
+
+    Returns:
+        Tuple of (fitted parameters, residuals model - data at the solution).
+    """
+    res = least_squares(
+        lambda params: model(t, *params) - production,
+        x0,
+        jac=lambda params: jac(t, *params),
+        bounds=bounds,
+        method="trf",
+        loss="soft_l1",
+        f_scale=f_scale,
+        x_scale="jac",
+        ftol=1e-5,
+        xtol=1e-5,
+        max_nfev=2000,
+    )
+    if not res.success:
+        raise RuntimeError(res.message)
+    return res.x, res.fun
+
+
+def _fit_best_decline(
+    time_months: np.ndarray, production: np.ndarray, method: str
+) -> Dict:
+    """Uncached implementation of `fit_best_decline`."""
     best_fit = {"method": None, "score": float("inf"), "params": []}
 
     # initial guesses
     qi_guess = np.max(production) if len(production) > 0 else 1000
     di_guess = 0.5
     b_guess = 1.2  # Typically > 1 for shale
+    # Residuals beyond ~10% of peak rate are down-weighted as outliers
+    f_scale = max(0.1 * qi_guess, 1.0)
 
     # 1. Arps / Modified Arps
     if method in ["arps", "modified_arps", "auto"]:
         try:
             # Bounds: qi > 0, 0 < di < 5, 0 <= b <= 2.5 (relaxed max b for shale)
-            popt, _ = curve_fit(
+            popt, residuals = _robust_fit(
                 arps_decline,
+                _arps_jac,
                 time_months,
                 production,
-                p0=[qi_guess, di_guess, b_guess],
+                x0=[qi_guess, di_guess, b_guess],
                 bounds=([0, 0, 0], [np.inf, 10, 3]),
-                maxfev=2000,
+                f_scale=f_scale,
             )
 
-            # Predict
-            pred = arps_decline(time_months, *popt)
-            mse = np.mean((production - pred) ** 2)
+            # Score from the solver's final residuals (model - data) rather
+            # than evaluating the model again
+            mse = np.mean(residuals**2)
+            pred = production + residuals
 
             if mse < best_fit["score"]:
                 best_fit = {
@@ -133,17 +251,19 @@ def fit_best_decline(
             # m typically 1.1 to 1.3 for shale logic slightly different,
             # standard Duong m is slope on log-log q/Gp plot.
             # Let's try basic bounds.
-            popt, _ = curve_fit(
-                duong_decline,
+            duong_model, duong_jac = _duong_fit_functions(time_months)
+            popt, residuals = _robust_fit(
+                duong_model,
+                duong_jac,
                 time_months,
                 production,
-                p0=[qi_guess, 1.0, 1.1],
+                x0=[qi_guess, 1.0, 1.1],
                 bounds=([0, 0, 0.5], [np.inf, 10, 2.0]),
-                maxfev=2000,
+                f_scale=f_scale,
             )
 
-            pred = duong_decline(time_months, *popt)
-            mse = np.mean((production - pred) ** 2)
+            mse = np.mean(residuals**2)
+            pred = production + residuals
 
             if mse < best_fit["score"]:
                 best_fit = {
@@ -1,11 +1,49 @@
-from typing import List, Dict
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+GAS_BOE_FACTOR = 5.8  # mcf per BOE
+
+
+def _net_cash_flow(
+    oil_vol: np.ndarray,
+    gas_vol: np.ndarray,
+    realized_oil_price,
+    realized_gas_price,
+    nri,
+    tax_rate,
+    opex_per_bbl,
+) -> np.ndarray:
+    """Monthly net cash flow; prices and rates broadcast against the volumes."""
+    # Net revenue after NRI and taxes, less OPEX (based on BOE), is linear in
+    # each volume, so fold the constants into a margin per bbl and per mcf.
+    net_share = nri - tax_rate
+    oil_margin = realized_oil_price * net_share - opex_per_bbl
+    gas_margin = realized_gas_price * net_share - opex_per_bbl / GAS_BOE_FACTOR
+
+    return oil_vol * oil_margin + gas_vol * gas_margin
+
+
+@lru_cache(maxsize=64)
+def _disc_factors(discount_rate: float, n_months: int) -> np.ndarray:
+    """
+    Monthly discount factors 1 / (1 + r_m)^t for t = 1..n_months.
+
+    Cached because sweeps reuse the same rate and horizon; the returned array
+    is read-only since it is shared between callers.
+    """
+    monthly_discount_rate = (1 + discount_rate) ** (1 / 12) - 1
+    factors = (1 + monthly_discount_rate) ** -np.arange(1, n_months + 1)
+    factors.setflags(write=False)
+    return factors
 
 
 def calculate_npv(
-    production_forecast_oil: List[float],
-    production_forecast_gas: List[float],
-    historical_production_oil: List[float] = [],
-    historical_production_gas: List[float] = [],
+    production_forecast_oil: Union[Sequence[float], np.ndarray],
+    production_forecast_gas: Union[Sequence[float], np.ndarray],
+    historical_production_oil: Union[Sequence[float], np.ndarray] = (),
+    historical_production_gas: Union[Sequence[float], np.ndarray] = (),
     oil_price: float = 70.0,
     gas_price: float = 3.5,
     discount_rate: float = 0.10,
@@ -23,10 +61,12 @@ def calculate_npv(
     Includes both Historical (Sunk) and Future (Forecast) production for oil and gas.
 
     Args:
-        production_forecast_oil: List of monthly oil production volumes (bbl).
-        production_forecast_gas: List of monthly gas production volumes (mcf).
-        historical_production_oil: List of monthly oil production volumes (bbl) - Historical.
-        historical_production_gas: List of monthly gas production volumes (mcf) - Historical.
+        production_forecast_oil: Monthly oil production volumes (bbl), as a list
+            or array.
+        production_forecast_gas: Monthly gas production volumes (mcf), as a list
+            or array.
+        historical_production_oil: Monthly oil production volumes (bbl) - Historical.
+        historical_production_gas: Monthly gas production volumes (mcf) - Historical.
         oil_price: WTI Price ($/bbl).
         gas_price: Henry Hub Price ($/mcf).
         discount_rate: Annual discount rate (e.g. 0.10 for 10%).
@@ -40,70 +80,161 @@ def calculate_npv(
         abandonment_rate: Economic Limit (bbl oil/month).
     """
 
-    monthly_discount_rate = (1 + discount_rate) ** (1 / 12) - 1
-
     # Combine streams
-    full_oil_stream = historical_production_oil + production_forecast_oil
-    full_gas_stream = historical_production_gas + production_forecast_gas
-
-    cash_flows = []
-    cumulative_cash_flow = -capex
-    payout_month = None
-
-    # Time 0: CAPEX
-    cash_flows.append(-capex)
+    full_oil_stream = np.concatenate(
+        [
+            np.asarray(historical_production_oil, dtype=np.float64),
+            np.asarray(production_forecast_oil, dtype=np.float64),
+        ]
+    )
+    full_gas_stream = np.concatenate(
+        [
+            np.asarray(historical_production_gas, dtype=np.float64),
+            np.asarray(production_forecast_gas, dtype=np.float64),
+        ]
+    )
+    n_months = min(len(full_oil_stream), len(full_gas_stream))
+
+    # Abandonment Check (Economic Limit based on oil production): production
+    # stops at the first month below the limit.
+    below_limit = full_oil_stream[:n_months] < abandonment_rate
+    if below_limit.any():
+        n_months = int(np.argmax(below_limit))
+
+    oil_vol = full_oil_stream[:n_months]
+    gas_vol = full_gas_stream[:n_months]
 
     realized_oil_price = oil_price + oil_diff
     realized_gas_price = gas_price + gas_diff
 
-    # Track total reserves
-    total_oil_eur = 0
-    total_gas_eur = 0
+    # Net Cash Flow per month, after the time-0 CAPEX
+    ncf = _net_cash_flow(
+        oil_vol,
+        gas_vol,
+        realized_oil_price,
+        realized_gas_price,
+        nri,
+        ad_valorem_tax + severance_tax,
+        opex_per_bbl,
+    )
+
+    cumulative_cash_flow = np.cumsum(ncf) - capex
+    paid_out = cumulative_cash_flow >= 0
+    payout_month = int(np.argmax(paid_out)) + 1 if paid_out.any() else -1
 
-    for month, (oil_vol, gas_vol) in enumerate(
-        zip(full_oil_stream, full_gas_stream), 1
-    ):
-        # Abandonment Check (Economic Limit based on oil production)
-        if oil_vol < abandonment_rate:
-            break
+    # Calculate NPV
+    npv = -capex + float(ncf @ _disc_factors(discount_rate, n_months))
 
-        total_oil_eur += oil_vol
-        total_gas_eur += gas_vol
+    roi = float(ncf.sum()) / capex
 
-        # Revenue from oil and gas
-        oil_revenue = oil_vol * realized_oil_price
-        gas_revenue = gas_vol * realized_gas_price
-        gross_revenue = oil_revenue + gas_revenue
-        net_revenue = gross_revenue * nri
+    # Track total reserves
+    total_oil_eur = float(oil_vol.sum())
+    total_gas_eur = float(gas_vol.sum())
 
-        # Taxes
-        taxes = gross_revenue * (ad_valorem_tax + severance_tax)
+    return {
+        "NPV": npv,
+        "ROI": roi,
+        "Payout_Months": payout_month,
+        "EUR_Oil": total_oil_eur,
+        "EUR_Gas": total_gas_eur,
+        "EUR": total_oil_eur + (total_gas_eur / GAS_BOE_FACTOR),  # BOE
+    }
 
-        # OPEX (based on BOE)
-        boe = oil_vol + (gas_vol / 5.8)  # Convert gas to BOE
-        opex = boe * opex_per_bbl
 
-        # Net Cash Flow
-        ncf = net_revenue - taxes - opex
+def _per_scenario(value) -> np.ndarray:
+    """Shapes a scalar or per-scenario (S,) input to broadcast over (S, M)."""
+    value = np.asarray(value, dtype=np.float64)
+    return value[:, np.newaxis] if value.ndim == 1 else value
 
-        cash_flows.append(ncf)
-        cumulative_cash_flow += ncf
 
-        if payout_month is None and cumulative_cash_flow >= 0:
-            payout_month = month
+def calculate_npv_batch(
+    production_forecasts_oil: np.ndarray,
+    production_forecasts_gas: Optional[np.ndarray] = None,
+    oil_price: Union[float, np.ndarray] = 70.0,
+    gas_price: Union[float, np.ndarray] = 3.5,
+    discount_rate: float = 0.10,
+    capex: Union[float, np.ndarray] = 6_000_000,
+    opex_per_bbl: Union[float, np.ndarray] = 10.0,
+    oil_diff: Union[float, np.ndarray] = -5.0,
+    gas_diff: Union[float, np.ndarray] = -0.5,
+    nri: Union[float, np.ndarray] = 0.80,
+    ad_valorem_tax: Union[float, np.ndarray] = 0.05,
+    severance_tax: Union[float, np.ndarray] = 0.05,
+    abandonment_rate: Union[float, np.ndarray] = 0.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized `calculate_npv` over many production / price scenarios at once.
 
-    # Calculate NPV
-    npv = -capex
-    for t, cf in enumerate(cash_flows[1:], 1):
-        npv += cf / ((1 + monthly_discount_rate) ** t)
+    Volumes are (S, M) arrays of S scenarios by M months (a single (M,) stream
+    is shared by every scenario). Price and cost inputs are scalars or (S,)
+    arrays, one value per scenario, e.g. for Monte Carlo or sensitivity sweeps.
+    Historical production, if any, should already be prepended to the streams.
 
-    roi = (sum(cash_flows) + capex) / capex
+    Args:
+        production_forecasts_oil: Monthly oil volumes (bbl), shape (S, M) or (M,).
+        production_forecasts_gas: Monthly gas volumes (mcf), same shape as oil.
+            Defaults to no gas.
+        oil_price, gas_price, capex, opex_per_bbl, oil_diff, gas_diff, nri,
+        ad_valorem_tax, severance_tax, abandonment_rate: As in `calculate_npv`.
+        discount_rate: Annual discount rate shared by all scenarios.
+
+    Returns:
+        Dict of (S,) arrays with the same keys as `calculate_npv`.
+    """
+    oil = np.atleast_2d(np.asarray(production_forecasts_oil, dtype=np.float64))
+    gas = (
+        np.zeros_like(oil)
+        if production_forecasts_gas is None
+        else np.atleast_2d(np.asarray(production_forecasts_gas, dtype=np.float64))
+    )
+
+    ncf = _net_cash_flow(
+        oil,
+        gas,
+        _per_scenario(oil_price) + _per_scenario(oil_diff),
+        _per_scenario(gas_price) + _per_scenario(gas_diff),
+        _per_scenario(nri),
+        _per_scenario(ad_valorem_tax) + _per_scenario(severance_tax),
+        _per_scenario(opex_per_bbl),
+    )
+    capex = np.asarray(capex, dtype=np.float64)
+    if ncf.shape[1] == 0:
+        # No months to produce (argmax is undefined): as in `calculate_npv`,
+        # only the capex is spent.
+        zeros = np.zeros(np.broadcast_shapes(ncf.shape[:1], capex.shape))
+        return {
+            "NPV": zeros - capex,
+            "ROI": zeros,
+            "Payout_Months": np.full(zeros.shape, -1),
+            "EUR_Oil": zeros,
+            "EUR_Gas": zeros,
+            "EUR": zeros,
+        }
+
+    # Abandonment: a scenario produces until its first month below the limit,
+    # found with one argmax per row as in `calculate_npv`.
+    below_limit = oil < _per_scenario(abandonment_rate)
+    n_producing = np.where(
+        below_limit.any(axis=1), below_limit.argmax(axis=1), below_limit.shape[1]
+    )
+    producing = np.arange(below_limit.shape[1]) < n_producing[:, None]
+    producing = np.broadcast_to(producing, ncf.shape)
+    ncf = np.where(producing, ncf, 0.0)
+
+    cumulative_cash_flow = np.cumsum(ncf, axis=1) - _per_scenario(capex)
+    paid_out = cumulative_cash_flow >= 0
+    payout_month = np.where(paid_out.any(axis=1), paid_out.argmax(axis=1) + 1, -1)
+
+    npv = ncf @ _disc_factors(discount_rate, ncf.shape[1]) - capex
+
+    total_oil_eur = np.where(producing, oil, 0.0).sum(axis=1)
+    total_gas_eur = np.where(producing, gas, 0.0).sum(axis=1)
 
     return {
         "NPV": npv,
-        "ROI": roi,
-        "Payout_Months": payout_month if payout_month else -1,
+        "ROI": ncf.sum(axis=1) / capex,
+        "Payout_Months": payout_month,
         "EUR_Oil": total_oil_eur,
         "EUR_Gas": total_gas_eur,
-        "EUR": total_oil_eur + (total_gas_eur / 5.8),  # BOE
+        "EUR": total_oil_eur + (total_gas_eur / GAS_BOE_FACTOR),  # BOE
     }
@@ -106,7 +106,7 @@ def run() -> None:
             "GCP_PROJECT_ID and BIGQUERY_DATASET environment variables are required"
         )
 
-    raw_ff, _ = pull_ff_data(state_name="Montana", keep_zip=True)
+    raw_ff, _ = pull_ff_data(state_name="Montana", keep_zip=True, purpose="Proppant")
     zip_path = Path("FracFocusCSV.zip")
     try:
         df = _aggregate_fracfocus(raw_ff)
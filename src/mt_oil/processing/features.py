@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from typing import Tuple
 
 
 def preprocess_ff_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -12,14 +13,14 @@ def preprocess_ff_data(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Aggregated data indexed by API_WellNo.
     """
-    # Drop duplicate reports
-    df.drop_duplicates(keep="last", inplace=True)
-
-    # group by API, and get total `Purpose` == 'Proppant' PercentHFJob
-    df = df[df.Purpose == "Proppant"]
+    # group by API, and get total `Purpose` == 'Proppant' PercentHFJob.
+    # Filtering first leaves far fewer rows to hash when dropping duplicate
+    # reports; the caller's frame is left untouched.
+    df = df[df["Purpose"].to_numpy() == "Proppant"]
+    df = df.drop_duplicates(keep="last")
 
     df = (
-        df.groupby("APINumber")
+        df.groupby("APINumber", sort=False)
         .agg(
             {
                 "PercentHFJob": "sum",
@@ -33,7 +34,14 @@ def preprocess_ff_data(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     # Assume zero values for volume/proppant, etc. are missing
-    df.replace(0, np.nan, inplace=True)
+    num_cols = [
+        "PercentHFJob",
+        "MassIngredient",
+        "TVD",
+        "TotalBaseWaterVolume",
+        "TotalBaseNonWaterVolume",
+    ]
+    df[num_cols] = df[num_cols].mask(df[num_cols] == 0)
 
     df = df.rename(columns={"APINumber": "API_WellNo"}).set_index("API_WellNo")
 
@@ -56,9 +64,59 @@ def preprocess_well_data(well_data_df: pd.DataFrame) -> pd.DataFrame:
     well_df = well_data_df[
         ["API_WellNo", "Lat", "Long", "Slant", "Type", "DTD"]
     ].set_index("API_WellNo")
+    # A handful of distinct values; the encoder and filters work on the codes
+    well_df["Slant"] = well_df["Slant"].astype("category")
     return well_df
 
 
+def _interval_totals(
+    group_ids: np.ndarray,
+    days: np.ndarray,
+    values: np.ndarray,
+    intervals: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sums each group's values over the rows that fall within each day interval.
+
+    Args:
+        group_ids (np.ndarray): Group code per row, numbered 0..n_groups-1.
+            Rows may be in any order.
+        days (np.ndarray): Cumulative producing days per row.
+        values (np.ndarray): (n_rows, n_values) volumes to total; no NaNs.
+        intervals (np.ndarray): Ascending interval cutoffs in days.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            - totals: (n_groups, n_intervals, n_values) sums for rows with
+              days <= cutoff.
+            - has_rows: (n_groups, n_intervals) mask of groups with at least
+              one row inside the cutoff.
+    """
+    n_groups = int(group_ids.max()) + 1 if len(group_ids) else 0
+    n_intervals = len(intervals)
+    n_values = values.shape[1]
+
+    # Bucket each row by the smallest cutoff it falls within; rows past the
+    # last cutoff (or with unknown days) land in bucket n_intervals and drop.
+    buckets = np.searchsorted(intervals, days, side="left")
+    inside = buckets < n_intervals
+    cells = group_ids[inside] * n_intervals + buckets[inside]
+    n_cells = n_groups * n_intervals
+
+    # One pass sums every (group, bucket) cell; a running sum across the
+    # buckets then gives the totals up to each cutoff.
+    counts = np.bincount(cells, minlength=n_cells).reshape(n_groups, n_intervals)
+    inside_values = values[inside]
+    totals = np.empty((n_cells, n_values))
+    for v in range(n_values):
+        totals[:, v] = np.bincount(
+            cells, weights=inside_values[:, v], minlength=n_cells
+        )
+    totals = totals.reshape(n_groups, n_intervals, n_values)
+
+    return np.cumsum(totals, axis=1), np.cumsum(counts, axis=1) > 0
+
+
 def preprocess_prod_data(well_prod_df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculates cumulative production totals for specified intervals (180, 360, 720 days).
@@ -80,62 +138,97 @@ def preprocess_prod_data(well_prod_df: pd.DataFrame) -> pd.DataFrame:
             "BBLS_WTR",
             "DAYS_PROD",
         ]
-    ]
+    ].copy()
 
     # Calculate cumulative days
     # Need to ensure sorted within groups
     df["Rpt_Date"] = pd.to_datetime(df["Rpt_Date"])  # Ensure datetime
-    df = df.sort_values(["API_WellNo", "Rpt_Date"])
-    df["TOTAL_DAYS"] = df.groupby("API_WellNo")["DAYS_PROD"].cumsum()
 
-    # Get First Prod Date per well
-    first_dates = df.groupby("API_WellNo")["Rpt_Date"].min().reset_index()
-    first_dates.rename(columns={"Rpt_Date": "First_Prod_Date"}, inplace=True)
+    # Sort by (API, date) with one lexsort over integer keys: sorted well
+    # codes and the raw datetime64 values, with missing dates last.
+    well_codes, _ = pd.factorize(df["API_WellNo"], sort=True)
+    dates = df["Rpt_Date"].to_numpy()
+    date_key = np.where(np.isnat(dates), np.iinfo(np.int64).max, dates.view(np.int64))
+    order = np.lexsort((date_key, well_codes))
+    df = df.take(order).reset_index(drop=True)
+    well_codes = well_codes[order]
+
+    # Per-well running sum of DAYS_PROD as one cumsum over the sorted column,
+    # minus each well's total before its first row. Missing days stay NaN, as
+    # with groupby().cumsum().
+    well_starts = np.flatnonzero(np.diff(well_codes, prepend=-2))
+    days = df["DAYS_PROD"].to_numpy(dtype=float)
+    running = np.cumsum(np.nan_to_num(days))
+    offsets = np.repeat(
+        running[well_starts] - np.nan_to_num(days[well_starts]),
+        np.diff(np.r_[well_starts, len(df)]),
+    )
+    total_days = running - offsets
+    total_days[np.isnan(days) | (well_codes < 0)] = np.nan
+    df["TOTAL_DAYS"] = total_days
+
+    # First Prod Date per well (dates are ascending within each well),
+    # broadcast to every row so it travels with the zone groups below.
+    df["First_Prod_Date"] = np.repeat(
+        df["Rpt_Date"].to_numpy()[well_starts], np.diff(np.r_[well_starts, len(df)])
+    )
 
-    # Vectorized approach
     intervals = [180, 360, 720]
-    results = []
-
-    for interval in intervals:
-        # Filter for days <= interval
-        mask = df["TOTAL_DAYS"] <= interval
-        interval_data = df[mask]
-
-        # Group by API and Zone
-        grouped = (
-            interval_data.groupby(["API_WellNo", "ST_FMTN_CD"])
-            .agg({"BBLS_OIL_COND": "sum", "BBLS_WTR": "sum", "MCF_GAS": "sum"})
-            .reset_index()
-        )
-
-        grouped["Interval"] = interval
-        results.append(grouped)
-
-    # Concatenate all intervals
-    totals_df = pd.concat(results, axis=0)
-
-    # Merge First Prod Date back to totals
-    totals_df = pd.merge(totals_df, first_dates, on="API_WellNo", how="left")
-
-    # Rename columns to match expected output format
-    totals_df = totals_df.rename(columns={"ST_FMTN_CD": "Zone"})
-
-    totals_df = totals_df[
-        [
-            "API_WellNo",
-            "Zone",
-            "Interval",
-            "BBLS_OIL_COND",
-            "BBLS_WTR",
-            "MCF_GAS",
-            "First_Prod_Date",
-        ]
-    ]
 
-    # restrict to oil wells (where oil > 0)
-    totals_df = totals_df[(totals_df["BBLS_OIL_COND"]) > 0]
+    # Only rows inside the longest interval can contribute, so drop the rest
+    # of each well's history (and rows without a zone, as groupby would)
+    # before any further sorting or aggregation.
+    keep = (df["TOTAL_DAYS"] <= max(intervals)) & df["ST_FMTN_CD"].notna()
+    keep = keep.to_numpy()
+    df = df[keep]
+    well_codes = well_codes[keep]
+
+    # Sort by (API, Zone) and number the groups in that order, again on
+    # integer codes. Missing volumes count as zero, matching the skipna
+    # behaviour of a plain groupby sum.
+    value_cols = ["BBLS_OIL_COND", "BBLS_WTR", "MCF_GAS"]
+    zone_codes, _ = pd.factorize(df["ST_FMTN_CD"], sort=True)
+    order = np.lexsort((zone_codes, well_codes))
+    df = df.take(order)
+    well_codes, zone_codes = well_codes[order], zone_codes[order]
+    new_group = (np.diff(well_codes, prepend=-1) != 0) | (
+        np.diff(zone_codes, prepend=-1) != 0
+    )
+    group_ids = np.cumsum(new_group) - 1
+    starts = np.flatnonzero(new_group)
+
+    totals, has_rows = _interval_totals(
+        group_ids,
+        df["TOTAL_DAYS"].to_numpy(dtype=float),
+        np.nan_to_num(df[value_cols].to_numpy(dtype=float)),
+        np.array(intervals),
+    )
 
-    totals_df = totals_df.set_index("API_WellNo")
+    # Lay the (group, interval) results out as flat columns, interval-major,
+    # restricted to oil wells (where oil > 0).
+    interval_idx, group_idx = np.nonzero(has_rows.T)
+    volumes = totals[group_idx, interval_idx]
+    is_oil = volumes[:, 0] > 0
+    interval_idx, group_idx, volumes = (
+        interval_idx[is_oil],
+        group_idx[is_oil],
+        volumes[is_oil],
+    )
+    group_keys = df.iloc[starts]
+
+    totals_df = pd.DataFrame(
+        {
+            "Zone": group_keys["ST_FMTN_CD"].to_numpy()[group_idx],
+            "Interval": np.array(intervals)[interval_idx],
+            "BBLS_OIL_COND": volumes[:, 0],
+            "BBLS_WTR": volumes[:, 1],
+            "MCF_GAS": volumes[:, 2],
+            "First_Prod_Date": group_keys["First_Prod_Date"].to_numpy()[group_idx],
+        },
+        index=pd.Index(
+            group_keys["API_WellNo"].to_numpy()[group_idx], name="API_WellNo"
+        ),
+    )
 
     return totals_df
 
@@ -257,13 +350,17 @@ def merge_data(
     ]
 
     # Merge
-    # detailed inner join implies we only want wells present in ALL datasets
-    data = pd.merge(well_df, prod_data, left_index=True, right_index=True)
-    data = pd.merge(data, ff_data, left_index=True, right_index=True)
+    # detailed inner join implies we only want wells present in ALL datasets.
+    # All three frames are indexed by API, so one multi-frame index join does
+    # the alignment; prod_data repeats wells per zone, which rules out concat.
+    data = well_df.join([prod_data, ff_data], how="inner")
 
     # Calculate BOE (Barrel of Oil Equivalent)
     # 5.8 or 6 is standard. Using 5.8 as per original code.
-    data["BOE"] = data["BBLS_OIL_COND"] + data["MCF_GAS"] / 5.8
+    # One output buffer: scale gas by the reciprocal, then add oil in place.
+    boe = np.multiply(data["MCF_GAS"].to_numpy(dtype=float), 1 / 5.8)
+    np.add(boe, data["BBLS_OIL_COND"].to_numpy(dtype=float), out=boe)
+    data["BOE"] = boe
 
     # Feature Engineering
     data = engineer_features(data)
@@ -50,7 +50,7 @@ def seed_mock_data():
                 }
             )
     prod_df = pd.DataFrame(prod_rows)
-    db.prod_df = prod_df.set_index("API_WellNo").sort_index()
+    db.prod_df = prod_df.sort_values(["API_WellNo", "Rpt_Date"]).set_index("API_WellNo")
 
     sums = db.prod_df.groupby(level=0)[["BBLS_OIL_COND", "MCF_GAS"]].sum()
     producing = sums[(sums["BBLS_OIL_COND"] > 0) | (sums["MCF_GAS"] > 0)]
@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 
@@ -57,3 +59,59 @@ def test_production_history(client):
             assert "NPV" in r_econ.json()
     else:
         pytest.skip("No well with sufficient production found in sample")
+
+
+def test_economics_reuses_decline_fit(client):
+    from mt_oil.api.main import _fit_cached
+
+    api = client.get("/wells?limit=1").json()[0]["API_WellNo"]
+    _fit_cached.cache_clear()
+
+    r_dca = client.post(f"/wells/{api}/decline?method=auto")
+    r_econ = client.post(f"/wells/{api}/economics")
+
+    assert r_dca.status_code == 200
+    assert r_econ.status_code == 200
+    info = _fit_cached.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_get_wells_filters_and_paginates(client):
+    response = client.get("/wells?has_production=true&well_type=OIL&skip=1&limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [w["API_WellNo"] for w in data] == ["3000000000002", "3000000000004"]
+    assert all(w["Type"] == "OIL" for w in data)
+
+
+def test_prod_arrays_skips_undated_reports(client, monkeypatch):
+    from mt_oil.api.main import _prod_arrays, db
+
+    api = client.get("/wells?limit=1").json()[0]["API_WellNo"]
+    prod_df = db.prod_df.copy()
+    rows = np.flatnonzero(prod_df.index == api)
+    # A NULL report date sorts last; it must not land on the time axis.
+    prod_df.iloc[rows[-1], prod_df.columns.get_loc("Rpt_Date")] = pd.NaT
+    monkeypatch.setattr(db, "prod_df", prod_df)
+
+    t_months, q_oil = _prod_arrays(api)
+
+    assert len(t_months) == len(q_oil) == len(rows) - 1
+    assert t_months.min() == 1 and t_months.max() < len(rows)
+
+
+def test_production_history_skips_undated_reports(client, monkeypatch):
+    from mt_oil.api.main import db
+
+    api = client.get("/wells?limit=1").json()[0]["API_WellNo"]
+    prod_df = db.prod_df.copy()
+    rows = np.flatnonzero(prod_df.index == api)
+    prod_df.iloc[rows[-1], prod_df.columns.get_loc("Rpt_Date")] = pd.NaT
+    prod_df.iloc[rows[0], prod_df.columns.get_loc("BBLS_WTR")] = np.nan
+    monkeypatch.setattr(db, "prod_df", prod_df)
+
+    history = client.get(f"/wells/{api}/production").json()
+
+    assert len(history) == len(rows) - 1
+    assert all(isinstance(r["Rpt_Date"], str) for r in history)
+    assert history[0]["BBLS_WTR"] == 0
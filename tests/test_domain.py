@@ -1,7 +1,17 @@
+import math
+
 import pytest
 import numpy as np
-from mt_oil.domain.decline_curve import fit_best_decline, arps_decline
-from mt_oil.domain.economics import calculate_npv
+from mt_oil.domain.decline_curve import (
+    _arps_jac,
+    _duong_fit_functions,
+    _fit_best_decline_cached,
+    arps_decline,
+    duong_decline,
+    fit_best_decline,
+    modified_arps_decline,
+)
+from mt_oil.domain.economics import _disc_factors, calculate_npv, calculate_npv_batch
 
 
 @pytest.mark.parametrize("method", ["arps", "duong", "auto"])
@@ -20,6 +30,28 @@ def test_decline_curve_fitting(method):
     assert len(result["params"]) > 0
 
 
+def test_arps_fit_resists_outlier():
+    t = np.arange(1, 61, dtype=float)
+    q = arps_decline(t, 800, 0.3, 1.1)
+    q[10] *= 4  # one flush-production spike
+
+    params = fit_best_decline(t, q, method="arps")["params"]
+
+    assert params["qi"] == pytest.approx(800, rel=0.05)
+    assert params["b"] == pytest.approx(1.1, rel=0.05)
+
+
+def test_duong_decline_accurate_near_unit_m():
+    t = np.arange(1, 61, dtype=float)
+    qi, a, m = 1000.0, 1.0, 1 + 2e-5
+    c, log_t = 1 - m, np.log(t)
+    # exp(a * (t^c - 1) / c) from its series in c, converged well below eps here
+    series = sum(c ** (k - 1) * log_t**k / math.factorial(k) for k in range(1, 12))
+    expected = qi * np.exp(-m * log_t + a * series)
+
+    np.testing.assert_allclose(duong_decline(t, qi, a, m), expected, rtol=1e-14)
+
+
 def test_economics_npv():
     # Simple case: 1 month production
     oil = [1000]
@@ -58,3 +90,149 @@ def test_economics_negative_case():
     )
     assert res["NPV"] < 0
     assert res["Payout_Months"] == -1
+
+
+def test_economics_abandonment_and_discounting():
+    res = calculate_npv(
+        production_forecast_oil=[1000, 500, 50, 400],
+        production_forecast_gas=[580, 580, 580, 580],
+        historical_production_oil=[2000],
+        historical_production_gas=[0],
+        oil_price=100.0,
+        gas_price=10.0,
+        oil_diff=0,
+        gas_diff=0,
+        capex=100_000,
+        opex_per_bbl=0.0,
+        ad_valorem_tax=0,
+        severance_tax=0,
+        nri=1.0,
+        discount_rate=0.21,
+        abandonment_rate=100.0,
+    )
+
+    # Production stops at the 50 bbl month, so only three months count.
+    ncf = np.array([200_000, 105_800, 55_800])
+    monthly = 1.21 ** (1 / 12) - 1
+    expected_npv = -100_000 + (ncf / (1 + monthly) ** np.arange(1, 4)).sum()
+    assert res["NPV"] == pytest.approx(expected_npv)
+    assert res["EUR_Oil"] == pytest.approx(3500)
+    assert res["EUR_Gas"] == pytest.approx(1160)
+    assert res["Payout_Months"] == 1
+
+
+def test_economics_npv_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    oil = rng.uniform(0, 2000, size=(5, 36))
+    gas = rng.uniform(0, 4000, size=(5, 36))
+    oil_prices = np.array([50.0, 60.0, 70.0, 80.0, 90.0])
+
+    batch = calculate_npv_batch(
+        oil, gas, oil_price=oil_prices, capex=500_000, abandonment_rate=100.0
+    )
+
+    for i, price in enumerate(oil_prices):
+        single = calculate_npv(
+            list(oil[i]),
+            list(gas[i]),
+            oil_price=price,
+            capex=500_000,
+            abandonment_rate=100.0,
+        )
+        for key, value in single.items():
+            assert batch[key][i] == pytest.approx(value)
+
+
+def test_economics_npv_batch_price_sweep_on_one_forecast():
+    oil = np.full(12, 1000.0)
+
+    res = calculate_npv_batch(oil, oil_price=np.array([40.0, 80.0]), capex=100_000)
+
+    assert res["NPV"].shape == (2,)
+    assert res["EUR_Oil"].tolist() == [12_000.0, 12_000.0]
+    assert res["NPV"][1] > res["NPV"][0]
+
+
+def _central_differences(model, t, params):
+    params = np.asarray(params, dtype=float)
+    numeric = np.empty((len(t), len(params)))
+    for i in range(len(params)):
+        step = np.zeros(len(params))
+        step[i] = 1e-6 * max(1.0, params[i])
+        numeric[:, i] = (model(t, *(params + step)) - model(t, *(params - step))) / (
+            2 * step[i]
+        )
+    return numeric
+
+
+@pytest.mark.parametrize("params", [(1000.0, 0.5, 1.2), (1000.0, 0.3, 0.0)])
+def test_arps_jacobian_matches_finite_differences(params):
+    t = np.arange(0.0, 48.0)
+
+    numeric = _central_differences(arps_decline, t, params)
+
+    np.testing.assert_allclose(_arps_jac(t, *params), numeric, rtol=1e-3, atol=1e-6)
+
+
+@pytest.mark.parametrize("params", [(1000.0, 1.0, 1.1), (800.0, 0.4, 0.7)])
+def test_duong_fit_functions_match_duong_decline(params):
+    t = np.arange(0.0, 48.0)
+    model, jac = _duong_fit_functions(t)
+
+    np.testing.assert_allclose(model(t, *params), duong_decline(t, *params))
+    numeric = _central_differences(duong_decline, t, params)
+    np.testing.assert_allclose(jac(t, *params), numeric, rtol=1e-4, atol=1e-6)
+
+
+def test_fit_best_decline_memoizes_on_content():
+    t = np.arange(1, 37)
+    q = arps_decline(t, 800.0, 0.3, 0.9)
+    before = _fit_best_decline_cached.cache_info().hits
+
+    first = fit_best_decline(t, q, method="arps")
+    first["params"]["qi"] = -1.0
+    second = fit_best_decline(t.astype(float), q.copy(), method="arps")
+
+    assert _fit_best_decline_cached.cache_info().hits == before + 1
+    assert second["params"]["qi"] == pytest.approx(800.0, rel=1e-3)
+
+
+def test_modified_arps_switches_to_terminal_decline():
+    t = np.arange(0.0, 240.0)
+    qi, di, b, d_lim = 1000.0, 0.5, 1.2, 0.06
+    t_switch = (di / d_lim - 1) / (b * di)
+
+    q = modified_arps_decline(t, qi, di, b, d_lim)
+
+    early = t <= t_switch
+    np.testing.assert_allclose(q[early], arps_decline(t[early], qi, di, b))
+    # Past the switch the month-over-month decline is the terminal rate.
+    late = q[~early]
+    np.testing.assert_allclose(late[1:] / late[:-1], np.exp(-d_lim))
+
+
+def test_discount_factors_are_cached_and_read_only():
+    factors = _disc_factors(0.10, 24)
+
+    assert factors is _disc_factors(0.10, 24)
+    assert not factors.flags.writeable
+    assert factors[11] == pytest.approx(1 / 1.10)
+
+
+def test_economics_npv_accepts_arrays():
+    oil = np.array([[1000.0, 0.0], [800.0, 0.0], [600.0, 0.0]])
+    gas = np.array([500.0, 400.0, 300.0])
+
+    from_arrays = calculate_npv(oil[1:, 0], gas[1:], oil[:1, 0], gas[:1])
+    from_lists = calculate_npv([800.0, 600.0], [400.0, 300.0], [1000.0], [500.0])
+
+    assert from_arrays == pytest.approx(from_lists)
+
+
+def test_npv_batch_empty_streams_spend_only_capex():
+    res = calculate_npv_batch(np.empty((3, 0)), capex=500_000, abandonment_rate=10.0)
+    single = calculate_npv([], [], capex=500_000)
+
+    np.testing.assert_allclose(res["NPV"], [single["NPV"]] * 3)
+    np.testing.assert_array_equal(res["Payout_Months"], [-1, -1, -1])
+    np.testing.assert_array_equal(res["EUR"], [0.0, 0.0, 0.0])
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mt_oil.processing.features import (
+    _interval_totals,
+    merge_data,
+    preprocess_ff_data,
+    preprocess_prod_data,
+)
+
+
+def _prod_rows(api, zone, months, oil, days=30, start="2020-01-01"):
+    dates = pd.date_range(start, periods=months, freq=pd.DateOffset(months=1))
+    return [
+        {
+            "API_WellNo": api,
+            "Rpt_Date": d.strftime("%Y-%m-%d"),
+            "ST_FMTN_CD": zone,
+            "BBLS_OIL_COND": oil,
+            "MCF_GAS": oil * 2,
+            "BBLS_WTR": 10.0,
+            "DAYS_PROD": days,
+        }
+        for d in dates
+    ]
+
+
+def test_preprocess_prod_data_interval_totals():
+    # 30 producing days per month: 6 months per 180 day interval
+    rows = _prod_rows("2500000001", "BKKN", 30, 100.0)
+    df = pd.DataFrame(rows).sample(frac=1, random_state=0)
+
+    totals = preprocess_prod_data(df)
+
+    assert list(totals["Interval"]) == [180, 360, 720]
+    assert list(totals["BBLS_OIL_COND"]) == pytest.approx([600.0, 1200.0, 2400.0])
+    assert list(totals["MCF_GAS"]) == pytest.approx([1200.0, 2400.0, 4800.0])
+    assert list(totals["BBLS_WTR"]) == pytest.approx([60.0, 120.0, 240.0])
+    assert (totals["First_Prod_Date"] == pd.Timestamp("2020-01-01")).all()
+    assert (totals.index == "2500000001").all()
+
+
+def test_preprocess_prod_data_zones_and_missing_values():
+    rows = _prod_rows("2500000001", "BKKN", 4, 100.0, days=60)
+    # Second zone reported mid-month; its days still advance the well clock.
+    rows += _prod_rows("2500000001", "TFKS", 4, 50.0, days=60, start="2020-01-15")
+    rows[1]["BBLS_OIL_COND"] = np.nan
+    # Gas-only well is dropped by the oil filter.
+    rows += _prod_rows("2500000002", "BKKN", 12, 0.0)
+    df = pd.DataFrame(rows)
+
+    totals = preprocess_prod_data(df).reset_index()
+
+    assert set(totals["API_WellNo"]) == {"2500000001"}
+    bkkn = totals[totals["Zone"] == "BKKN"].set_index("Interval")
+    tfks = totals[totals["Zone"] == "TFKS"].set_index("Interval")
+    # Cumulative well days alternate between zones: BKKN reaches 60, 180,
+    # 300, 420 and TFKS 120, 240, 360, 480. The missing February oil is zero.
+    assert bkkn.loc[180, "BBLS_OIL_COND"] == pytest.approx(100.0)
+    assert bkkn.loc[360, "BBLS_OIL_COND"] == pytest.approx(200.0)
+    assert bkkn.loc[720, "BBLS_OIL_COND"] == pytest.approx(300.0)
+    assert tfks.loc[180, "BBLS_OIL_COND"] == pytest.approx(50.0)
+    assert tfks.loc[360, "BBLS_OIL_COND"] == pytest.approx(150.0)
+    assert tfks.loc[720, "BBLS_OIL_COND"] == pytest.approx(200.0)
+
+
+def test_interval_totals_kernel():
+    # Rows need not be ordered; row 6 is past the last cutoff.
+    group_ids = np.array([0, 2, 0, 1, 1, 0, 0])
+    days = np.array([200.0, 90.0, 30.0, 400.0, 500.0, 700.0, 800.0])
+    values = np.column_stack([[2.0, 6.0, 1.0, 4.0, 5.0, 3.0, 100.0], np.zeros(7)])
+
+    totals, has_rows = _interval_totals(
+        group_ids, days, values, np.array([180, 360, 720])
+    )
+
+    assert totals.shape == (3, 3, 2)
+    np.testing.assert_array_equal(
+        has_rows, [[True, True, True], [False, False, True], [True, True, True]]
+    )
+    np.testing.assert_allclose(totals[:, :, 0], [[1, 3, 6], [0, 0, 9], [6, 6, 6]])
+    assert (totals[:, :, 1] == 0).all()
+
+
+def test_preprocess_ff_data_zero_volumes_are_missing():
+    raw = pd.DataFrame(
+        {
+            "APINumber": ["2500000001", "2500000001", "2500000002"],
+            "Purpose": ["Proppant", "Proppant", "Proppant"],
+            "PercentHFJob": [8.0, 2.0, 0.0],
+            "MassIngredient": [4e6, 1e6, 3e6],
+            "TVD": [10_000.0, 10_000.0, 0.0],
+            "TotalBaseWaterVolume": [9e6, 9e6, 7e6],
+            "TotalBaseNonWaterVolume": [0.0, 0.0, 0.0],
+        }
+    )
+
+    ff = preprocess_ff_data(raw)
+
+    assert ff.loc["2500000001", "PercentHFJob"] == pytest.approx(10.0)
+    assert ff.loc["2500000001", "MassIngredient"] == pytest.approx(5e6)
+    assert pd.isna(ff.loc["2500000002", "PercentHFJob"])
+    assert pd.isna(ff.loc["2500000002", "TVD"])
+    assert ff["TotalBaseNonWaterVolume"].isna().all()
+
+
+def test_merge_data_inner_joins_on_api():
+    def idx(apis):
+        return pd.Index(apis, name="API_WellNo")
+
+    wells = pd.DataFrame(
+        {"Lat": [47.0, 48.0], "Long": [-104.0, -105.0], "Slant": ["Horizontal"] * 2},
+        index=idx(["2500000001", "2500000002"]),
+    )
+    wells["DTD"] = [20_000.0, 21_000.0]
+    totals = pd.DataFrame(
+        {
+            "Interval": [720, 720, 360, 720],
+            "Zone": ["BKKN", "TFKS", "BKKN", "BKKN"],
+            "BBLS_OIL_COND": [5800.0, 1000.0, 1.0, 2000.0],
+            "BBLS_WTR": 0.0,
+            "MCF_GAS": [5800.0, 0.0, 0.0, 0.0],
+            "First_Prod_Date": pd.Timestamp("2020-01-01"),
+        },
+        index=idx(["2500000001", "2500000001", "2500000001", "2500000003"]),
+    )
+    ff = pd.DataFrame(
+        {
+            "TVD": [10_000.0, 10_000.0],
+            "MassIngredient": [5e6, 5e6],
+            "TotalBaseWaterVolume": [9e6, 9e6],
+        },
+        index=idx(["2500000001", "2500000002"]),
+    )
+
+    data = merge_data(totals, wells, ff)
+
+    # Only the well present in all three inputs survives, once per zone.
+    assert list(data.index) == ["2500000001", "2500000001"]
+    assert list(data["Zone"]) == ["BKKN", "TFKS"]
+    assert list(data["BOE"]) == pytest.approx([5800.0 + 1000.0, 1000.0])
+    assert list(data["Lateral_Length"]) == pytest.approx([10_000.0, 10_000.0])
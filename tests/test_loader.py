@@ -0,0 +1,228 @@
+"""Tests for the local DNRC / FracFocus download loaders."""
+
+import dataclasses
+import io
+import zipfile
+from unittest.mock import patch
+from urllib.error import URLError
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from mt_oil.config import settings
+from mt_oil.data.loader import pull_ff_data, pull_well_data
+
+
+def _zip_bytes(files: dict) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, text in files.items():
+            zf.writestr(name, text)
+    return buf.getvalue()
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data: bytes = b"", headers: dict | None = None):
+        super().__init__(data)
+        self.headers = headers or {}
+
+
+def _fake_urlopen(data: bytes, etag: str | None = None):
+    """Serve *data* for GET requests and *etag* for HEAD requests."""
+    calls = {"GET": 0, "HEAD": 0}
+
+    def urlopen(req, *args, **kwargs):
+        method = getattr(req, "method", None) or "GET"
+        calls[method] += 1
+        if method == "HEAD":
+            if etag is None:
+                raise URLError("offline")
+            return FakeResponse(headers={"ETag": etag})
+        return FakeResponse(data)
+
+    return urlopen, calls
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    cache = tmp_path / "cache"
+    with patch(
+        "mt_oil.data.loader.settings",
+        dataclasses.replace(settings, data_cache_dir=str(cache)),
+    ):
+        yield cache
+
+
+def _registry_csv() -> str:
+    return pd.DataFrame(
+        {
+            "APINumber": ["25083000010000", "25083000010000", "33053000020000"],
+            "StateName": ["Montana", "Montana", "North Dakota"],
+            "Purpose": ["Proppant", "Friction Reducer", "Proppant"],
+            "PercentHFJob": [10.0, 0.1, 12.0],
+            "MassIngredient": [5_000_000.0, 100.0, 6_000_000.0],
+            "TVD": [10_500.0, 10_500.0, 11_000.0],
+            "TotalBaseWaterVolume": [9_000_000.0, 9_000_000.0, 8_000_000.0],
+            "TotalBaseNonWaterVolume": [0.0, 0.0, 0.0],
+            "IngredientName": ["Sand", "Polymer", "Sand"],
+        }
+    ).to_csv(index=False)
+
+
+@pytest.fixture
+def ff_zip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = _zip_bytes(
+        {
+            "FracFocusRegistry_1.csv": _registry_csv(),
+            "readme.txt": "not a registry file",
+        }
+    )
+    urlopen, _ = _fake_urlopen(data)
+    with patch("mt_oil.data.loader.urlopen", side_effect=urlopen):
+        yield tmp_path
+
+
+def test_pull_ff_data_filters_state(ff_zip):
+    registry_df, upload_df = pull_ff_data(state_name="Montana")
+
+    assert len(registry_df) == 2
+    assert set(registry_df["StateName"]) == {"Montana"}
+    assert "IngredientName" not in registry_df.columns
+    assert upload_df.empty
+    assert not (ff_zip / "FracFocusCSV.zip").exists()
+
+
+def test_pull_ff_data_filters_purpose(ff_zip):
+    registry_df, _ = pull_ff_data(state_name="Montana", purpose="Proppant")
+
+    assert len(registry_df) == 1
+    assert registry_df["MassIngredient"].iloc[0] == pytest.approx(5_000_000.0)
+
+
+def test_pull_ff_data_no_matching_rows(ff_zip):
+    registry_df, _ = pull_ff_data(state_name="Wyoming")
+
+    assert registry_df.empty
+    assert {"APINumber", "Purpose", "MassIngredient"} <= set(registry_df.columns)
+
+
+def test_pull_ff_data_keep_zip(ff_zip):
+    pull_ff_data(keep_zip=True)
+
+    assert (ff_zip / "FracFocusCSV.zip").exists()
+
+
+def test_pull_well_data_reads_tab(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tab = pd.DataFrame(
+        {
+            "API_WellNo": ["25083000010000", "25083000020000"],
+            "Well_Nm": ["A 1H", "B 1"],
+            "Lat": [47.5, 47.6],
+            "Long": [-105.2, -105.3],
+            "Slant": ["Horizontal", ""],
+            "Type": ["OIL", "GAS"],
+            "DTD": [20_000, None],
+        }
+    ).to_csv(sep="\t", index=False)
+    data = _zip_bytes({"MT_HistoricalWellList.tab": tab})
+    urlopen, _ = _fake_urlopen(data)
+    with patch("mt_oil.data.loader.urlopen", side_effect=urlopen):
+        well_df = pull_well_data()
+
+    assert len(well_df) == 2
+    assert list(well_df.columns) == [
+        "API_WellNo",
+        "Lat",
+        "Long",
+        "Slant",
+        "Type",
+        "DTD",
+    ]
+    assert well_df["API_WellNo"].iloc[0] == "25083000010000"
+    assert well_df["Lat"].dtype == "float64"
+    assert well_df["Slant"].iloc[0] == "Horizontal"
+    assert pd.isna(well_df["Slant"].iloc[1])
+    # Parsed straight from the archive: nothing is written to the working dir.
+    assert not list(tmp_path.glob("*.zip")) and not list(tmp_path.glob("*.tab"))
+
+
+def test_cached_download_reused_while_etag_unchanged(tmp_path, monkeypatch, cache_dir):
+    monkeypatch.chdir(tmp_path)
+    data = _zip_bytes({"FracFocusRegistry_1.csv": _registry_csv()})
+
+    urlopen, calls = _fake_urlopen(data, etag='"v1"')
+    with patch("mt_oil.data.loader.urlopen", side_effect=urlopen):
+        first, _ = pull_ff_data(purpose="Proppant")
+        second, _ = pull_ff_data(purpose="Proppant")
+
+    assert calls == {"GET": 1, "HEAD": 2}
+    assert list(cache_dir.glob("*.parquet"))
+    pd.testing.assert_frame_equal(first, second)
+
+    urlopen, calls = _fake_urlopen(data, etag='"v2"')
+    with patch("mt_oil.data.loader.urlopen", side_effect=urlopen):
+        pull_ff_data(purpose="Proppant")
+
+    assert calls == {"GET": 1, "HEAD": 1}
+
+
+def test_keep_zip_bypasses_cache(tmp_path, monkeypatch, cache_dir):
+    monkeypatch.chdir(tmp_path)
+    data = _zip_bytes({"FracFocusRegistry_1.csv": _registry_csv()})
+
+    urlopen, calls = _fake_urlopen(data, etag='"v1"')
+    with patch("mt_oil.data.loader.urlopen", side_effect=urlopen):
+        pull_ff_data(keep_zip=True)
+
+    assert calls == {"GET": 1, "HEAD": 0}
+    assert not cache_dir.exists()
+
+
+def test_cache_invalidated_when_column_schema_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tab = (
+        "API_WellNo\tLat\tLong\tSlant\tType\tDTD\n"
+        "25083000010000\t47.5\t-105.2\tHorizontal\tOIL\t20000\n"
+    )
+    data = _zip_bytes({"MT_HistoricalWellList.tab": tab})
+
+    urlopen, calls = _fake_urlopen(data, etag='"v1"')
+    with patch("mt_oil.data.loader.urlopen", side_effect=urlopen):
+        pull_well_data()
+        pull_well_data()
+        assert calls["GET"] == 1
+
+        narrower = {"API_WellNo": pa.string(), "Lat": None}
+        with patch("mt_oil.data.loader.WELL_LIST_COLUMNS", narrower):
+            well_df = pull_well_data()
+
+    assert calls["GET"] == 2
+    assert list(well_df.columns) == ["API_WellNo", "Lat"]
+
+
+def _serve_registry(csv_text: str):
+    urlopen, _ = _fake_urlopen(_zip_bytes({"FracFocusRegistry_1.csv": csv_text}))
+    return patch("mt_oil.data.loader.urlopen", side_effect=urlopen)
+
+
+def test_pull_ff_data_quoted_header(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    header, *rows = _registry_csv().splitlines()
+    quoted = ",".join(f'" {name}"' for name in header.split(","))
+
+    with _serve_registry("\ufeff" + "\n".join([quoted, *rows]) + "\n"):
+        registry_df, _ = pull_ff_data(state_name="Montana", purpose="Proppant")
+
+    assert len(registry_df) == 1
+    assert "IngredientName" not in registry_df.columns
+    assert registry_df["MassIngredient"].dtype == "float64"
+
+
+def test_pull_ff_data_rejects_unknown_header(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    with _serve_registry("Foo,Bar\n1,2\n"), pytest.raises(ValueError):
+        pull_ff_data()
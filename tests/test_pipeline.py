@@ -0,0 +1,19 @@
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from mt_oil.models.pipeline import load_model, save_model
+
+
+def test_save_model_keeps_served_model_valid(tmp_path):
+    X = np.random.default_rng(0).random((200, 3))
+    y = X @ [1.0, 2.0, 3.0]
+    path = str(tmp_path / "model.joblib")
+    save_model(HistGradientBoostingRegressor(max_iter=10).fit(X, y), path)
+    served = load_model(path)
+    expected = served.predict(X)
+
+    # Retraining overwrites the artifact the served model is mapped from.
+    save_model(HistGradientBoostingRegressor(max_iter=3).fit(X, y), path)
+
+    np.testing.assert_allclose(served.predict(X), expected)
+    assert [p.name for p in tmp_path.iterdir()] == ["model.joblib"]